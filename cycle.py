@@ -0,0 +1,80 @@
+import logging
+from time import monotonic, time
+
+logger = logging.getLogger(__name__)
+
+
+class CycleExecutor:
+    """
+    Runs the steps of one update cycle against a shared time budget.
+
+    The budget is not a deadline: it is only checked before each step, and once it is spent the remaining steps are
+    skipped, except for ``critical`` ones, which always run. A step that has started runs until its API calls return
+    or hit their HTTP timeouts, so the worst case for a cycle is the number of calls it makes times the
+    (connect + read) timeout, whatever the budget. A step that raises is logged and recorded in :attr:`failed`, and the
+    cycle carries on with the next one.
+    """
+
+    def __init__(self, budget, heartbeat_file=None):
+        """
+        :type budget: float
+        :type heartbeat_file: str
+        """
+        self._budget = budget
+        self._heartbeat_file = heartbeat_file
+        self._start_time = monotonic()
+        self._end_time = self._start_time + budget
+        self.completed = []
+        self.skipped = []
+        self.failed = []
+        self.failed_critical = []
+
+    @property
+    def remaining(self):
+        return max(0.0, self._end_time - monotonic())
+
+    def run_step(self, name, func, *args, critical=False, **kwargs):
+        """
+        Run one step of the cycle, returning its result, or ``None`` if it was skipped or failed.
+        """
+        if not critical and self.remaining <= 0:
+            logger.warning('Cycle budget of %0.0f seconds spent, skipping %s', self._budget, name)
+            self.skipped.append(name)
+            return None
+        try:
+            value = func(*args, **kwargs)
+        except Exception:
+            logger.exception('Step "%s" failed', name)
+            self.failed.append(name)
+            if critical:
+                self.failed_critical.append(name)
+            return None
+        self.completed.append(name)
+        return value
+
+    def finish(self):
+        """
+        Log a summary of the cycle and write the heartbeat, unless a critical step failed.
+        """
+        if self.skipped or self.failed:
+            logger.warning('Cycle finished in %0.1f seconds with %d step(s) failed %s and %d skipped %s',
+                           monotonic() - self._start_time, len(self.failed), self.failed, len(self.skipped),
+                           self.skipped)
+        else:
+            logger.debug('Cycle finished in %0.1f seconds', monotonic() - self._start_time)
+        if self.failed_critical:
+            logger.error('Critical step(s) %s failed, not writing heartbeat', self.failed_critical)
+            return
+        self.beat()
+
+    def beat(self):
+        """
+        Record a heartbeat for liveness probes: the heartbeat file holds the unix time of the last good cycle.
+        """
+        if not self._heartbeat_file:
+            return
+        try:
+            with open(self._heartbeat_file, 'w') as f:
+                f.write('{:0.0f}\n'.format(time()))
+        except OSError as e:
+            logger.error('Could not write heartbeat file %s: %s', self._heartbeat_file, e)
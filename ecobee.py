@@ -4,15 +4,19 @@ import math
 import os
 import signal
 import sys
+from copy import deepcopy
 from datetime import datetime, timedelta
 from threading import Event
 
 import pyowm
 import pytz
+from pyowm.utils.config import get_default_config
 from pyowm.weatherapi25.forecaster import Forecaster
 from pyowm.weatherapi25.observation import Observation
 
+from cycle import CycleExecutor
 from ecobee_data import EcobeeData
+from occupancy import OccupancyTracker
 from utils import wait, string_to_bool
 
 log_handler = logging.StreamHandler(sys.stderr)
@@ -34,6 +38,7 @@ INNER_FILM_R = 0.8
 polling_interval = 30
 
 ecobee: EcobeeData = None
+occupancy: OccupancyTracker = None
 ecobee_api_key: str = None
 owm_api_key: str = None
 
@@ -76,8 +81,10 @@ def desired_humid_perc(inside_temp, outside_temp, r_value: float = 2.5,
     return calc_relative_humidity(inside_temp, des_dewpoint)
 
 
-def adjust_fan_min(ecobee):
-    occupied = ecobee.occupied()
+def adjust_fan_min(ecobee, occupied):
+    if occupied is None:
+        logger.warning("no fresh occupancy data, not changing fan min runtime")
+        return
     current_fan = ecobee.get_fan_min_on_time()
     occupied_fan = int(os.environ.get('FAN_OCCUPIED_TIME', 20))
     away_fan = int(os.environ.get('FAN_AWAY_TIME', 5))
@@ -95,10 +102,12 @@ def adjust_fan_min(ecobee):
             logger.info("no need to change fan min runtime")
 
 
-def switch_backlight():
+def switch_backlight(occupied):
     if string_to_bool(os.environ.get('SWITCH_BACKLIGHT', 'true')):
         # if str(os.environ.get('SWITCH_BACKLIGHT', 1)).lower() not in ['0', 'false', 'f']:
-        if ecobee.occupied():
+        if occupied is None:
+            logger.warning("no fresh occupancy data, not switching backlight")
+        elif occupied:
             ecobee.turn_backlight_on()
         else:
             ecobee.turn_backlight_off()
@@ -164,22 +173,36 @@ def get_fan_runtime():
     return rt_rounded
 
 
-def run():
-    global ecobee
-    ecobee = EcobeeData(shelf_name, thermostat_name, ecobee_api_key, exit_signal)
-    ecobee.get_token()
-    # ecobee.get_humidity_mode()
-    # return
-    ecobee.store_backlight_settings()
+def occupancy_needed():
+    return string_to_bool(os.environ.get('SWITCH_BACKLIGHT', 'true')) or \
+           os.environ.get('FAN_MODE', 'DELTA').lower()[:3] == 'occ'
+
+
+def update_occupancy():
+    occupancy.update(ecobee.get_occupancy_snapshot())
+    for name, (sensor_occupied, last_change) in occupancy.sensors.items():
+        logger.debug("Sensor %s occupied: %s since %s", name, sensor_occupied,
+                     datetime.fromtimestamp(last_change).strftime('%H:%M:%S'))
+    occupied = occupancy.occupied()
+    since = occupancy.time_since_occupied()
+    if since:
+        logger.info("Occupied: %s (empty for %0.0f seconds)", occupied, since)
+    else:
+        logger.info("Occupied: %s", occupied)
+    return occupied
+
+
+def set_fan_runtime(occupied):
     fan_mode = os.environ.get('FAN_MODE', 'DELTA').lower()
     if fan_mode[:3] == 'del':
         fantime = get_fan_runtime()
         logger.info('Setting min fan runtime to %d', fantime)
         ecobee.set_fan_min_on_time(fantime)
     elif fan_mode[:3] == 'occ':
-        adjust_fan_min(ecobee)
-    switch_backlight()
+        adjust_fan_min(ecobee, occupied)
+
 
+def set_humidity_setpoint():
     in_temp, des_in_temp = ecobee.get_cur_inside_temp()
     outside_temp, future_out_temp = get_owm_outside_temps()
     future_des_temp = ecobee.get_future_set_temp()
@@ -200,14 +223,35 @@ def run():
     rh_set = round(rh_set / 2) * 2
     logger.info("actual humidity setting %0.1f%%", rh_set)
     ecobee.set_humidity(round(rh_set))
-    switch_humidifier()
+
+
+def run():
+    global ecobee
+    ecobee = EcobeeData(shelf_name, thermostat_name, ecobee_api_key, exit_signal, call_timeout)
+    ecobee.get_token()
+    cycle = CycleExecutor(cycle_budget, heartbeat_file)
+    cycle.run_step('humidity setpoint', set_humidity_setpoint)
+    occupied = None
+    if occupancy_needed():
+        # None when the snapshot failed or was skipped, so backlight and fan leave things alone this cycle
+        occupied = cycle.run_step('occupancy', update_occupancy)
+    cycle.run_step('store backlight settings', ecobee.store_backlight_settings)
+    if 'store backlight settings' not in cycle.failed:
+        # without stored settings turning the backlight on would push empty settings
+        cycle.run_step('backlight', switch_backlight, occupied)
+    cycle.run_step('fan', set_fan_runtime, occupied)
+    # the humidifier must never be left running without heat, so this step ignores the cycle budget
+    cycle.run_step('humidifier', switch_humidifier, critical=True)
     ecobee = None
+    cycle.finish()
 
 
 def get_owm_outside_temps():
     cur_weather: Observation
     cur_forecast: Forecaster
-    owm = pyowm.OWM(owm_api_key).weather_manager()
+    owm_config = deepcopy(get_default_config())
+    owm_config['connection']['timeout_secs'] = call_timeout
+    owm = pyowm.OWM(owm_api_key, owm_config).weather_manager()
     location_lat = os.environ.get('OWM_LATITUDE', None)
     location_lon = os.environ.get('OWM_LONGITUDE', None)
     location_id = os.environ.get('OWM_ID', None)
@@ -247,11 +291,16 @@ if __name__ == '__main__':
     temp_delta = float(os.environ.get('DEWPOINT_DELTA', TEMP_DELTA))
     r_value = float(os.environ.get('R_VALUE', R_VALUE))
     update_interval = int(os.environ.get('UPDATE_INTERVAL', 600))
+    cycle_budget = float(os.environ.get('CYCLE_BUDGET', 60))
+    # (connect, read) seconds for every ecobee and OWM request
+    call_timeout = (float(os.environ.get('CONNECT_TIMEOUT', 3)), float(os.environ.get('CALL_TIMEOUT', 5)))
+    heartbeat_file = os.environ.get('HEARTBEAT_FILE', 'heartbeat')
     max_steam_humidity = float(os.environ.get('MAX_STEAM_HUMIDITY', 40))
     steam_humidity_hysteresis = float(os.environ.get('STEAM_HUMIDITY_HYST', 2))
 
     max_humidity = float(os.environ.get('MAX_HUMIDITY', 50))
     min_humidity = float(os.environ.get('MIN_HUMIDITY', 10))
+    occupancy = OccupancyTracker(float(os.environ.get('OCCUPANCY_DEBOUNCE', 0)))
     loglevel = os.environ.get('LOG_LEVEL', "INFO")
     numeric_level = getattr(logging, loglevel.upper(), 20)
     logger.setLevel(numeric_level)
@@ -20,6 +20,7 @@ class EcobeeData:
     _backlight_settings: peb.Settings = None
     _got_token = False
     _exit_event: Event = None
+    _timeout: tuple = (3, 5)
 
     _backlight_on = peb.Settings(backlight_off_during_sleep=False,
                                  backlight_off_time=20,
@@ -33,8 +34,9 @@ class EcobeeData:
                                   backlight_on_intensity=0
                                   )
 
-    def __init__(self, shelf_filename, thermostat_name, ecobee_api_key, exit_event):
+    def __init__(self, shelf_filename, thermostat_name, ecobee_api_key, exit_event, timeout=(3, 5)):
         self._exit_event = exit_event
+        self._timeout = timeout
         self._shelf_filename = shelf_filename
         pyecobee_db: shelve.DbfilenameShelf = None
         try:
@@ -98,7 +100,8 @@ class EcobeeData:
     def sensors(self):
         thermostat_response = self.ecobee_service.request_thermostats(
             peb.Selection(selection_type=peb.SelectionType.REGISTERED.value, selection_match='',
-                          include_sensors=True)
+                          include_sensors=True),
+            timeout=self._timeout
         )
         sensors = thermostat_response.thermostat_list[0].remote_sensors
         return sensors
@@ -122,13 +125,13 @@ class EcobeeData:
         shelf.close()
 
     def refresh_tokens(self):
-        response = self.ecobee_service.refresh_tokens()
+        response = self.ecobee_service.refresh_tokens(timeout=self._timeout)
         logger.debug('TokenResponse returned from ecobee_service.refresh_tokens():\n{0}'.format(
             response.pretty_format()))
         self.persist_to_shelf()
 
     def authorize(self):
-        self.authorize_response = self.ecobee_service.authorize()
+        self.authorize_response = self.ecobee_service.authorize(timeout=self._timeout)
         logger.debug('AutorizeResponse returned from ecobee_service.authorize():\n{0}'.format(
             self.authorize_response.pretty_format()))
         self.authorize_expires = datetime.utcnow() + \
@@ -148,7 +151,7 @@ class EcobeeData:
     def wait_for_token(self):
         while datetime.utcnow() < self.authorize_expires and not self._exit_event.is_set():
             try:
-                token_response = self.ecobee_service.request_tokens()
+                token_response = self.ecobee_service.request_tokens(timeout=self._timeout)
                 logger.debug("Got token:\n%s", token_response.pretty_format())
                 self.persist_to_shelf()
                 break
@@ -194,7 +197,7 @@ class EcobeeData:
         return peb.Selection(selection_type=peb.SelectionType.REGISTERED.value, selection_match='', **kwargs)
 
     def _get_selection(self, selection, **kwargs):
-        return self.ecobee_service.request_thermostats(selection)
+        return self.ecobee_service.request_thermostats(selection, timeout=self._timeout)
 
     def set_humidity_mode(self, mode):
         self._set_settings(
@@ -204,7 +207,8 @@ class EcobeeData:
     def get_humidity_mode(self):
         thermostat_response = self.ecobee_service.request_thermostats(
             peb.Selection(selection_type=peb.SelectionType.REGISTERED.value, selection_match='',
-                          include_settings=True)
+                          include_settings=True),
+            timeout=self._timeout
         )
         return thermostat_response.thermostat_list[0].settings.humidifier_mode
 
@@ -216,7 +220,8 @@ class EcobeeData:
     def store_backlight_settings(self):
         thermostat_response = self.ecobee_service.request_thermostats(
             peb.Selection(selection_type=peb.SelectionType.REGISTERED.value, selection_match='',
-                          include_settings=True)
+                          include_settings=True),
+            timeout=self._timeout
         )
 
         bl_settings: peb.Settings = thermostat_response.thermostat_list[0].settings
@@ -241,7 +246,8 @@ class EcobeeData:
         thermostat_response = self.ecobee_service.update_thermostats(
             selection=sel,
             thermostat=peb.Thermostat(identifier=ident,
-                                      settings=settings)
+                                      settings=settings),
+            timeout=self._timeout
         )
         logger.debug(thermostat_response.pretty_format())
 
@@ -254,7 +260,8 @@ class EcobeeData:
     def get_cur_inside_temp(self):
         thermostat_response = self.ecobee_service.request_thermostats(
             peb.Selection(selection_type=peb.SelectionType.REGISTERED.value, selection_match='',
-                          include_runtime=True)
+                          include_runtime=True),
+            timeout=self._timeout
         )
         inside_temp = thermostat_response.thermostat_list[0].runtime.actual_temperature / 10.0
         des_inside_temp = thermostat_response.thermostat_list[0].runtime.desired_heat / 10.0
@@ -263,7 +270,8 @@ class EcobeeData:
     def get_cur_inside_humidity(self):
         thermostat_response = self.ecobee_service.request_thermostats(
             peb.Selection(selection_type=peb.SelectionType.REGISTERED.value, selection_match='',
-                          include_runtime=True)
+                          include_runtime=True),
+            timeout=self._timeout
         )
         humidity = thermostat_response.thermostat_list[0].runtime.actual_humidity
         return float(humidity)
@@ -271,39 +279,33 @@ class EcobeeData:
     def get_cur_hvac_mode(self):
         thermostat_response = self.ecobee_service.request_thermostats(
             peb.Selection(selection_type=peb.SelectionType.REGISTERED.value, selection_match='',
-                          include_equipment_status=True)
+                          include_equipment_status=True),
+            timeout=self._timeout
         )
         return thermostat_response.thermostat_list[0].equipment_status
 
     def get_fan_min_on_time(self):
         thermostat_response = self.ecobee_service.request_thermostats(
             peb.Selection(selection_type=peb.SelectionType.REGISTERED.value, selection_match='',
-                          include_settings=True)
+                          include_settings=True),
+            timeout=self._timeout
         )
         return thermostat_response.thermostat_list[0].settings.fan_min_on_time
 
-    def occupied(self):
+    def get_occupancy_snapshot(self):
         thermostat_response = self.ecobee_service.request_thermostats(
             selection=peb.Selection(selection_type=peb.SelectionType.REGISTERED.value, selection_match='',
-                                    include_sensors=True, include_program=True, include_events=True)
+                                    include_sensors=True, include_program=True, include_events=True),
+            timeout=self._timeout
         )
-        if thermostat_response.thermostat_list[0].program.current_climate_ref in ['home', 'sleep']:
-            return True
-
-        for sensor in thermostat_response.thermostat_list[0].remote_sensors:
-            caps = [a.value == 'true' for a in sensor.capability if a.type == 'occupancy']
-            if any(caps):
-                return True
-        for event in thermostat_response.thermostat_list[0].events:
-            if event.running and (event.heat_hold_temp > 640 or event.cool_hold_temp < 760):
-                return True
-        return False
+        return thermostat_response.thermostat_list[0]
 
     def get_future_set_temp(self):
 
         thermostat_response = self.ecobee_service.request_thermostats(
             selection=peb.Selection(selection_type=peb.SelectionType.REGISTERED.value, selection_match='',
-                                    include_program=True, include_events=True)
+                                    include_program=True, include_events=True),
+            timeout=self._timeout
         )
         thermostat = thermostat_response.thermostat_list[0]
         therm_time = datetime.strptime(thermostat.thermostat_time, '%Y-%m-%d %H:%M:%S')
@@ -0,0 +1,103 @@
+import logging
+from time import time
+
+logger = logging.getLogger(__name__)
+
+
+class OccupancyTracker:
+    """
+    Keeps occupancy state between update cycles.
+
+    Each cycle fetches one full thermostat snapshot (sensors, program and events) and feeds it to :meth:`update`, which
+    scans it and records each sensor's occupancy and when it last changed. :meth:`occupied` then answers from the
+    stored state, so the backlight and fan logic share that one request instead of each making their own. A change in
+    occupancy is only reported once it has held for ``debounce`` seconds.
+    """
+
+    def __init__(self, debounce=0, occupied_climates=('home', 'sleep')):
+        """
+        :type debounce: float
+        :type occupied_climates: tuple
+        """
+        self._debounce = debounce
+        self._occupied_climates = occupied_climates
+        self._sensors = {}
+        self._occupied_sensors = set()
+        self._raw = None
+        self._raw_since = None
+        self._state = None
+        self._vacated = None
+
+    @property
+    def sensors(self):
+        """
+        Per-sensor ``(occupied, last_change)`` tuples, keyed by sensor name.
+        """
+        return dict(self._sensors)
+
+    def update(self, thermostat, now=None):
+        """
+        :type thermostat: pyecobee.Thermostat
+        :type now: float
+        """
+        now = time() if now is None else now
+        seen = set()
+        for sensor in thermostat.remote_sensors:
+            seen.add(sensor.name)
+            occupied = any(a.value == 'true' for a in sensor.capability if a.type == 'occupancy')
+            previous = self._sensors.get(sensor.name)
+            if previous is not None and previous[0] == occupied:
+                continue
+            logger.debug('Sensor %s occupancy -> %s', sensor.name, occupied)
+            self._sensors[sensor.name] = (occupied, now)
+            if occupied:
+                self._occupied_sensors.add(sensor.name)
+            else:
+                self._occupied_sensors.discard(sensor.name)
+        for name in set(self._sensors) - seen:
+            logger.debug('Sensor %s no longer reported', name)
+            del self._sensors[name]
+            self._occupied_sensors.discard(name)
+
+        climate_occupied = thermostat.program.current_climate_ref in self._occupied_climates
+        event_occupied = any(event.running and (event.heat_hold_temp > 640 or event.cool_hold_temp < 760)
+                             for event in thermostat.events)
+
+        raw = climate_occupied or event_occupied or bool(self._occupied_sensors)
+        if self._raw is None:
+            self._state = raw
+            self._raw_since = now
+        elif raw != self._raw:
+            self._raw_since = now
+        self._raw = raw
+
+    def occupied(self, now=None):
+        """
+        Debounced occupancy as of the last :meth:`update`, or ``None`` if there has not been one yet.
+
+        :type now: float
+        """
+        if self._raw is not None and self._raw != self._state:
+            now = time() if now is None else now
+            if now - self._raw_since >= self._debounce:
+                logger.debug('Occupancy -> %s', self._raw)
+                self._state = self._raw
+                if not self._state:
+                    self._vacated = self._raw_since
+        return self._state
+
+    def time_since_occupied(self, now=None):
+        """
+        Seconds since occupancy ended, following the debounced state of :meth:`occupied`. It is counted from the
+        first update that saw the house empty, so it lags the real departure by up to one cycle. It is 0 while
+        :meth:`occupied` is true, and ``None`` if occupancy has not been seen end since the process started
+        (including when the house was already empty at the first update).
+
+        :type now: float
+        """
+        now = time() if now is None else now
+        if self.occupied(now):
+            return 0.0
+        if self._vacated is None:
+            return None
+        return now - self._vacated
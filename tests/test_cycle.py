@@ -0,0 +1,59 @@
+import cycle
+from cycle import CycleExecutor
+
+
+def fail():
+    raise RuntimeError('boom')
+
+
+def test_steps_run_within_budget():
+    executor = CycleExecutor(60)
+    assert executor.run_step('a', lambda x: x * 2, 21) == 42
+    assert executor.completed == ['a']
+
+
+def test_non_critical_skipped_once_budget_spent(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(cycle, 'monotonic', lambda: clock[0])
+    executor = CycleExecutor(10)
+    executor.run_step('a', lambda: None)
+    clock[0] = 110.0
+    assert executor.remaining == 0
+    assert executor.run_step('b', lambda: 1) is None
+    assert executor.completed == ['a']
+    assert executor.skipped == ['b']
+
+
+def test_critical_runs_after_budget():
+    executor = CycleExecutor(0)
+    executor.run_step('optional', lambda: 1)
+    assert executor.run_step('critical', lambda: 2, critical=True) == 2
+    assert executor.skipped == ['optional']
+    assert executor.completed == ['critical']
+
+
+def test_failures_recorded_and_cycle_continues():
+    executor = CycleExecutor(60)
+    assert executor.run_step('a', fail) is None
+    executor.run_step('b', lambda: None)
+    executor.run_step('c', fail, critical=True)
+    assert executor.failed == ['a', 'c']
+    assert executor.failed_critical == ['c']
+    assert executor.completed == ['b']
+
+
+def test_heartbeat_written_after_good_cycle(tmp_path):
+    heartbeat = tmp_path / 'heartbeat'
+    executor = CycleExecutor(60, str(heartbeat))
+    executor.run_step('a', fail)
+    executor.run_step('critical', lambda: None, critical=True)
+    executor.finish()
+    assert heartbeat.read_text().strip().isdigit()
+
+
+def test_no_heartbeat_after_critical_failure(tmp_path):
+    heartbeat = tmp_path / 'heartbeat'
+    executor = CycleExecutor(60, str(heartbeat))
+    executor.run_step('critical', fail, critical=True)
+    executor.finish()
+    assert not heartbeat.exists()
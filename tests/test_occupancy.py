@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+from occupancy import OccupancyTracker
+
+
+def sensor(name, occupied):
+    return SimpleNamespace(name=name, capability=[
+        SimpleNamespace(type='temperature', value='700'),
+        SimpleNamespace(type='occupancy', value='true' if occupied else 'false'),
+    ])
+
+
+def thermostat(*sensors, climate='away'):
+    return SimpleNamespace(remote_sensors=list(sensors),
+                           program=SimpleNamespace(current_climate_ref=climate),
+                           events=[])
+
+
+def test_no_update_is_unknown():
+    tracker = OccupancyTracker()
+    assert tracker.occupied(now=0) is None
+    assert tracker.time_since_occupied(now=0) is None
+
+
+def test_first_update_sets_state_immediately():
+    tracker = OccupancyTracker(debounce=300)
+    tracker.update(thermostat(sensor('a', True)), now=0)
+    assert tracker.occupied(now=0) is True
+
+    tracker = OccupancyTracker(debounce=300)
+    tracker.update(thermostat(sensor('a', False)), now=0)
+    assert tracker.occupied(now=0) is False
+    assert tracker.time_since_occupied(now=0) is None
+
+
+def test_change_held_until_debounce_passes():
+    tracker = OccupancyTracker(debounce=300)
+    tracker.update(thermostat(sensor('a', True)), now=0)
+    tracker.update(thermostat(sensor('a', False)), now=100)
+    assert tracker.occupied(now=100) is True
+    assert tracker.occupied(now=399) is True
+    assert tracker.occupied(now=400) is False
+    assert tracker.time_since_occupied(now=400) == 300
+    assert tracker.sensors == {'a': (False, 100)}
+
+
+def test_flip_back_inside_window_cancels_change():
+    tracker = OccupancyTracker(debounce=300)
+    tracker.update(thermostat(sensor('a', True)), now=0)
+    tracker.update(thermostat(sensor('a', False)), now=100)
+    tracker.update(thermostat(sensor('a', True)), now=200)
+    assert tracker.occupied(now=1000) is True
+    assert tracker.time_since_occupied(now=1000) == 0
+
+
+def test_removed_sensor_no_longer_counts():
+    tracker = OccupancyTracker()
+    tracker.update(thermostat(sensor('a', True), sensor('b', False)), now=0)
+    assert tracker.occupied(now=0) is True
+    tracker.update(thermostat(sensor('b', False)), now=100)
+    assert tracker.occupied(now=100) is False
+    assert 'a' not in tracker.sensors
+
+
+def test_occupied_climate_counts():
+    tracker = OccupancyTracker()
+    tracker.update(thermostat(sensor('a', False), climate='home'), now=0)
+    assert tracker.occupied(now=0) is True
+
+
+def test_time_since_occupied_follows_debounced_state():
+    tracker = OccupancyTracker(debounce=300)
+    tracker.update(thermostat(sensor('a', True)), now=0)
+    tracker.update(thermostat(sensor('a', False)), now=100)
+    for now in (100, 300, 399):
+        assert tracker.occupied(now=now) is True
+        assert tracker.time_since_occupied(now=now) == 0
+    assert tracker.occupied(now=400) is False
+    assert tracker.time_since_occupied(now=400) == 300